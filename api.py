@@ -5,13 +5,39 @@ Flask API for IRRES Location Scraper
 Provides REST endpoints to fetch locations from IRRES.be
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
+from flask.json.provider import JSONProvider
+import orjson
 from scraper import IRRESLocationScraper, get_irres_locations, get_irres_office_images
+import config
+import csv
+import io
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain
+
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson for faster serialization."""
+    
+    mimetype = "application/json"
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Write orjson's bytes straight into the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +46,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker threads for running independent scrapes concurrently
+executor = ThreadPoolExecutor(max_workers=4)
+
+
+def request_timestamp():
+    """
+    Get the timestamp of the current request, computed once per request.
+    
+    Returns:
+        ISO formatted timestamp string
+    """
+    if 'timestamp' not in g:
+        g.timestamp = datetime.now().isoformat()
+    return g.timestamp
+
 
 @app.route('/', methods=['GET'])
 def index():
@@ -36,6 +77,7 @@ def index():
         "endpoints": {
             "GET /api/locations": "Fetch all available property locations",
             "GET /api/office-images": "Fetch IRRES office images",
+            "GET /api/all": "Fetch locations and office images in one call, each shaped as its own endpoint's data",
             "GET /api/health": "Check API health status"
         }
     }), 200
@@ -48,6 +90,7 @@ def get_locations():
     
     Query Parameters:
         - format: Output format (json, csv) - default: json
+        - no_cache: Set to 1 to bypass the cached result
     
     Returns:
         JSON response with locations list
@@ -56,7 +99,7 @@ def get_locations():
         logger.info("Fetching locations from IRRES.be")
         
         # Get locations
-        result = get_irres_locations()
+        result = get_irres_locations(use_cache=not _no_cache())
         
         # Check output format
         output_format = request.args.get('format', 'json').lower()
@@ -67,21 +110,21 @@ def get_locations():
         # Default JSON format
         response = {
             "status": "success",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": request_timestamp(),
             "data": {
                 "locations": result['locations'],
                 "count": len(result['locations'])
             }
         }
         
-        logger.info(f"Successfully retrieved {len(result['locations'])} locations")
+        logger.info("Successfully retrieved %d locations", len(result['locations']))
         return jsonify(response), 200
         
     except Exception as e:
-        logger.error(f"Error fetching locations: {str(e)}")
+        logger.error("Error fetching locations: %s", e)
         return jsonify({
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": request_timestamp(),
             "message": str(e)
         }), 500
 
@@ -91,6 +134,9 @@ def get_office_images():
     """
     Get IRRES office images from the contact page.
     
+    Query Parameters:
+        - no_cache: Set to 1 to bypass the cached result
+    
     Returns:
         JSON response with office images
     """
@@ -98,25 +144,76 @@ def get_office_images():
         logger.info("Fetching office images from IRRES.be")
         
         # Get office images
-        result = get_irres_office_images()
+        result = get_irres_office_images(use_cache=not _no_cache())
         
         response = {
             "status": result['status'],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": request_timestamp(),
             "data": result['images']
         }
         
         if result['status'] == 'success':
-            logger.info(f"Successfully retrieved {result['count']} office images")
+            logger.info("Successfully retrieved %d office images", result['count'])
             return jsonify(response), 200
         else:
             return jsonify(response), 500
         
     except Exception as e:
-        logger.error(f"Error fetching office images: {str(e)}")
+        logger.error("Error fetching office images: %s", e)
         return jsonify({
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": request_timestamp(),
+            "message": str(e)
+        }), 500
+
+
+@app.route('/api/all', methods=['GET'])
+def get_all():
+    """
+    Get locations and office images in one call.
+    Both pages are scraped concurrently.
+    
+    Query Parameters:
+        - no_cache: Set to 1 to bypass the cached results
+    
+    Returns:
+        JSON response with the locations and office images data, nested
+        under "locations" and "office_images" as their own endpoints return them
+    """
+    try:
+        logger.info("Fetching locations and office images from IRRES.be")
+        
+        use_cache = not _no_cache()
+        locations_future = executor.submit(get_irres_locations, use_cache)
+        images_future = executor.submit(get_irres_office_images, use_cache)
+        locations_result = locations_future.result()
+        images_result = images_future.result()
+        
+        response = {
+            "status": "success",
+            "timestamp": request_timestamp(),
+            "data": {
+                "locations": {
+                    "locations": locations_result['locations'],
+                    "count": len(locations_result['locations'])
+                },
+                "office_images": images_result['images']
+            }
+        }
+        
+        errors = [r['error'] for r in (locations_result, images_result) if r['status'] != 'success']
+        if errors:
+            response["status"] = "error"
+            response["message"] = "; ".join(errors)
+            return jsonify(response), 500
+        
+        return jsonify(response), 200
+        
+    except Exception as e:
+        logger.error("Error fetching IRRES data: %s", e)
+        return jsonify({
+            "status": "error",
+            "timestamp": request_timestamp(),
             "message": str(e)
         }), 500
 
@@ -131,14 +228,19 @@ def health_check():
     """
     return jsonify({
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": request_timestamp(),
         "service": "IRRES Location Scraper"
     }), 200
 
 
+def _no_cache():
+    """Check whether the request asks to bypass the scrape cache."""
+    return request.args.get('no_cache', '0').lower() in ('1', 'true', 'yes')
+
+
 def format_csv_response(locations):
     """
-    Format locations as CSV.
+    Format locations as a streamed CSV response.
     
     Args:
         locations: List of location strings
@@ -146,11 +248,19 @@ def format_csv_response(locations):
     Returns:
         CSV formatted response
     """
-    csv_content = "location\n"
-    csv_content += "\n".join(locations)
+    def generate():
+        # Write one row at a time so the full CSV is never held in memory
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        rows = chain([("location",)], ((location,) for location in locations))
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
     
     return app.response_class(
-        response=csv_content,
+        response=generate(),
         status=200,
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment;filename=irres_locations.csv"}
@@ -163,7 +273,7 @@ def not_found(error):
     return jsonify({
         "status": "error",
         "message": "Endpoint not found",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": request_timestamp()
     }), 404
 
 
@@ -173,14 +283,17 @@ def server_error(error):
     return jsonify({
         "status": "error",
         "message": "Internal server error",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": request_timestamp()
     }), 500
 
 
 if __name__ == '__main__':
+    if config.FLASK_ENV != 'development':
+        raise SystemExit("Use gunicorn in production: gunicorn -c gunicorn.conf.py wsgi:app")
+    
     # Development server
     app.run(
-        host='0.0.0.0',
-        port=5000,
-        debug=True
+        host=config.HOST,
+        port=config.PORT,
+        debug=config.FLASK_DEBUG
     )
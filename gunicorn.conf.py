@@ -0,0 +1,23 @@
+# ===== irres-location-scraper ======
+
+"""
+Gunicorn configuration for production deployment
+Usage: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+# Import names only: a module bound to `config` would clash with gunicorn's own setting
+from config import HOST, PORT, LOG_LEVEL
+
+bind = f"{HOST}:{PORT}"
+
+# Scrapes are I/O-bound: run 2n+1 workers with a few threads each so
+# requests are served concurrently while one is waiting on irres.be
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+accesslog = '-'
+loglevel = LOG_LEVEL.lower()
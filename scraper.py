@@ -7,25 +7,150 @@ Handles UTF-8 character normalization automatically.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+import threading
 import unicodedata
-from typing import List, Dict
+import time
+from typing import Any, Callable, List, Dict, Optional, Tuple
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Prefer the C-based lxml parser, fall back to the pure-Python one
+try:
+    from lxml import etree, html as lxml_html
+    PARSER = "lxml"
+except ImportError:
+    lxml_html = None
+    PARSER = "html.parser"
+
+# Only <picture> subtrees are needed from the contact page
+_PICTURE_STRAINER = SoupStrainer('picture')
+
+# Image URL fragments identifying each office
+_LATEM_MARKERS = ('7723384', 'kerstgevel')
+_DESTELBERGEN_MARKERS = ('7723383', 'destelbergen')
+
+# Known non-location labels to exclude
+_EXCLUDED_LABELS = frozenset({
+    'appartement', 'huis', 'grond', 'contact',
+    'droomwoning', 'nieuwbouw', 'verkocht', 'verkopen',
+    'te-koop', 'aanbod', 'rekrutering'
+})
+
 logger = logging.getLogger(__name__)
 
+# Request headers shared by all scrapers. Accept-Encoding (gzip/deflate, plus br
+# when brotli is installed) and keep-alive come from the session defaults.
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml"
+}
+
+# Shared HTTP session so both scrapers reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504]
+    )
+))
+
+# In-process TTL cache for scrape results: key -> (stored_at, result)
+CACHE_TTL = 900
+_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+# Scrapes currently running per cache key, shared by concurrent cache misses
+_INFLIGHT: Dict[str, "_Flight"] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Last response body per URL with its validators, for conditional GETs
+_CONDITIONAL: Dict[str, Tuple[Dict[str, str], bytes]] = {}
+
+
+def _conditional_get(url: str, headers: Dict[str, str], timeout: int) -> bytes:
+    """
+    Fetch a URL, revalidating the previously fetched body with ETag / Last-Modified.
+    
+    Args:
+        url: URL to fetch
+        headers: Request headers
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Raw response body (the stored body on 304 Not Modified)
+        
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    cached = _CONDITIONAL.get(url)
+    if cached:
+        headers = {**headers, **cached[0]}
+    
+    response = SESSION.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        logger.info("Not modified: %s", url)
+        return cached[1]
+    response.raise_for_status()
+    
+    validators = {}
+    if response.headers.get('ETag'):
+        validators['If-None-Match'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        validators['If-Modified-Since'] = response.headers['Last-Modified']
+    if validators:
+        _CONDITIONAL[url] = (validators, response.content)
+    else:
+        _CONDITIONAL.pop(url, None)
+    
+    return response.content
+
+
+class IRRESScraper:
+    """
+    Base class for IRRES.be page scrapers.
+    Subclasses set BASE_URL and share the session, headers and fetch logic.
+    """
+    
+    BASE_URL = "https://irres.be"
+    HEADERS = DEFAULT_HEADERS
+    
+    def __init__(self, timeout: int = 10):
+        """
+        Initialize the scraper.
+        
+        Args:
+            timeout: Request timeout in seconds (default: 10)
+        """
+        self.timeout = timeout
+    
+    def fetch_page(self) -> bytes:
+        """
+        Fetch the page at BASE_URL.
+        
+        Returns:
+            Raw HTML content of the page (encoding is detected by the parser)
+            
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        try:
+            logger.info("Fetching page: %s", self.BASE_URL)
+            return _conditional_get(self.BASE_URL, self.HEADERS, self.timeout)
+        except requests.RequestException as e:
+            logger.error("Failed to fetch page: %s", e)
+            raise
+
 
-class IRRESLocationScraper:
+class IRRESLocationScraper(IRRESScraper):
     """
     Scraper for extracting property locations from IRRES.be
     """
     
     BASE_URL = "https://irres.be/te-koop"
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
     
     def __init__(self, timeout: int = 10):
         """
@@ -34,7 +159,7 @@ class IRRESLocationScraper:
         Args:
             timeout: Request timeout in seconds (default: 10)
         """
-        self.timeout = timeout
+        super().__init__(timeout)
         self.locations = []
     
     @staticmethod
@@ -54,30 +179,34 @@ class IRRESLocationScraper:
         result = ''.join(c for c in nfd if unicodedata.category(c) != 'Mn')
         return result
     
-    def fetch_page(self) -> str:
+    @staticmethod
+    def _extract_labels(html: bytes) -> List[str]:
         """
-        Fetch the IRRES.be property listing page.
+        Collect all data-label attribute values from HTML content.
+        Uses a single lxml XPath query when possible, BeautifulSoup otherwise.
         
-        Returns:
-            HTML content of the page
+        Args:
+            html: HTML content to parse
             
-        Raises:
-            requests.RequestException: If the request fails
+        Returns:
+            List of raw label values
         """
-        try:
-            logger.info(f"Fetching page: {self.BASE_URL}")
-            response = requests.get(
-                self.BASE_URL,
-                headers=self.HEADERS,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch page: {e}")
-            raise
+        if not html or not html.strip():
+            return []
+        
+        if lxml_html is not None:
+            try:
+                encoding = UnicodeDammit(html, is_html=True).original_encoding
+                tree = lxml_html.document_fromstring(html, parser=lxml_html.HTMLParser(encoding=encoding))
+                return tree.xpath('//*[@data-label]/@data-label')
+            except (etree.ParserError, LookupError, ValueError):
+                # Documents lxml rejects (e.g. comment-only) go through BeautifulSoup
+                pass
+        
+        soup = BeautifulSoup(html, PARSER)
+        return [element.get('data-label', '') for element in soup.find_all(attrs={"data-label": True})]
     
-    def parse_locations(self, html: str) -> List[str]:
+    def parse_locations(self, html: bytes) -> List[str]:
         """
         Parse locations from HTML content.
         Extracts location labels from data attributes.
@@ -88,32 +217,21 @@ class IRRESLocationScraper:
         Returns:
             List of unique locations
         """
-        soup = BeautifulSoup(html, 'html.parser')
         locations_set = set()
         
-        # Known non-location labels to exclude
-        excluded_labels = {
-            'appartement', 'huis', 'grond', 'contact',
-            'droomwoning', 'nieuwbouw', 'verkocht', 'verkopen',
-            'te-koop', 'aanbod', 'rekrutering'
-        }
-        
-        # Find all elements with data-label attribute
-        elements = soup.find_all(attrs={"data-label": True})
-        
-        for element in elements:
-            label = element.get('data-label', '').strip()
+        for label in self._extract_labels(html):
+            label = label.strip()
             
             # Filter out non-location labels
             if (label and 
-                label.lower() not in excluded_labels and
+                label.lower() not in _EXCLUDED_LABELS and
                 '€' not in label and
-                not any(char.isdigit() for char in label)):
+                not any(map(str.isdigit, label))):
                 locations_set.add(label)
         
         # Convert to sorted list
-        locations = sorted(list(locations_set))
-        logger.info(f"Found {len(locations)} unique locations")
+        locations = sorted(locations_set)
+        logger.info("Found %d unique locations", len(locations))
         
         return locations
     
@@ -134,7 +252,7 @@ class IRRESLocationScraper:
                 "status": "success"
             }
         except Exception as e:
-            logger.error(f"Scraping failed: {e}")
+            logger.error("Scraping failed: %s", e)
             return {
                 "locations": [],
                 "count": 0,
@@ -152,60 +270,93 @@ class IRRESLocationScraper:
         return self.locations
 
 
-def get_irres_locations() -> Dict[str, List[str]]:
+def _is_fresh(key: str) -> bool:
+    """Check whether a cached entry exists and is younger than CACHE_TTL."""
+    entry = _CACHE.get(key)
+    return entry is not None and time.monotonic() - entry[0] < CACHE_TTL
+
+
+class _Flight:
+    """
+    A scrape in progress whose result is handed to every caller waiting on it.
+    """
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+def _store(key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Cache a scrape result if it succeeded and return it."""
+    if result.get('status') == 'success':
+        _CACHE[key] = (time.monotonic(), result)
+    return result
+
+
+def _cached(key: str, scrape: Callable[[], Dict[str, Any]], use_cache: bool) -> Dict[str, Any]:
+    """
+    Return a cached scrape result, or run the scrape and cache it on success.
+    Concurrent cache misses for a key share one scrape and all receive its
+    result, errors included; forced refreshes (use_cache=False) run immediately.
+    
+    Args:
+        key: Cache key
+        scrape: Callable performing the actual scrape
+        use_cache: If False, always scrape and refresh the cached entry
+        
+    Returns:
+        Scrape result dictionary
+    """
+    if not use_cache:
+        return _store(key, scrape())
+    
+    if _is_fresh(key):
+        return _CACHE[key][1]
+    
+    # Single-flight: the first miss runs the scrape, later misses wait for its result
+    with _INFLIGHT_LOCK:
+        if _is_fresh(key):
+            return _CACHE[key][1]
+        flight = _INFLIGHT.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _INFLIGHT[key] = _Flight()
+    
+    if not is_leader:
+        flight.done.wait()
+        # The leader only leaves no result if its scrape raised
+        return flight.result if flight.result is not None else scrape()
+    
+    try:
+        flight.result = _store(key, scrape())
+        return flight.result
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[key]
+        flight.done.set()
+
+
+def get_irres_locations(use_cache: bool = True) -> Dict[str, List[str]]:
     """
     Convenience function to fetch IRRES locations.
     
+    Args:
+        use_cache: Serve a cached result if it is younger than CACHE_TTL (default: True)
+    
     Returns:
         Dictionary containing locations list
     """
-    scraper = IRRESLocationScraper()
-    return scraper.scrape()
+    return _cached('locations', IRRESLocationScraper().scrape, use_cache)
 
 
-class IRRESOfficeImagesScraper:
+class IRRESOfficeImagesScraper(IRRESScraper):
     """
     Scraper for extracting office images from IRRES.be contact page
     """
     
     BASE_URL = "https://irres.be/contact"
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-    
-    def __init__(self, timeout: int = 10):
-        """
-        Initialize the scraper.
-        
-        Args:
-            timeout: Request timeout in seconds (default: 10)
-        """
-        self.timeout = timeout
     
-    def fetch_page(self) -> str:
-        """
-        Fetch the IRRES.be contact page.
-        
-        Returns:
-            HTML content of the page
-            
-        Raises:
-            requests.RequestException: If the request fails
-        """
-        try:
-            logger.info(f"Fetching page: {self.BASE_URL}")
-            response = requests.get(
-                self.BASE_URL,
-                headers=self.HEADERS,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch page: {e}")
-            raise
-    
-    def parse_office_images(self, html: str) -> Dict[str, str]:
+    def parse_office_images(self, html: bytes) -> Dict[str, str]:
         """
         Parse office images from HTML content.
         
@@ -215,32 +366,23 @@ class IRRESOfficeImagesScraper:
         Returns:
             Dictionary with office images
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, PARSER, parse_only=_PICTURE_STRAINER)
         images = {}
         
-        # Find all picture elements that contain the office images
-        picture_elements = soup.find_all('picture')
-        
-        for picture in picture_elements:
-            # Find img tags within picture elements
-            img = picture.find('img')
-            if not img:
+        for img in soup.select('picture img[srcset]'):
+            # Extract the first URL from srcset
+            srcset = img['srcset'].split(None, 1)
+            if not srcset:
                 continue
+            url = srcset[0].lstrip('/')
             
-            srcset = img.get('srcset', '')
-            alt = img.get('alt', '').lower()
-            
-            # Extract the first URL from srcset
-            if srcset:
-                url = srcset.split()[0].lstrip('/')
-                
-                # Identify which office based on the URL or alt text
-                if '7723384' in url or 'kerstgevel' in url or 'latem' in alt:
-                    images['IrresLatemImage'] = f"https://irres.be/{url}"
-                elif '7723383' in url or 'destelbergen' in url:
-                    images['IrresDestelbergenImage'] = f"https://irres.be/{url}"
+            # Identify which office based on the URL or alt text
+            if any(marker in url for marker in _LATEM_MARKERS) or 'latem' in img.get('alt', '').lower():
+                images['IrresLatemImage'] = f"https://irres.be/{url}"
+            elif any(marker in url for marker in _DESTELBERGEN_MARKERS):
+                images['IrresDestelbergenImage'] = f"https://irres.be/{url}"
         
-        logger.info(f"Found {len(images)} office images")
+        logger.info("Found %d office images", len(images))
         return images
     
     def scrape(self) -> Dict[str, any]:
@@ -260,7 +402,7 @@ class IRRESOfficeImagesScraper:
                 "count": len(images)
             }
         except Exception as e:
-            logger.error(f"Scraping failed: {e}")
+            logger.error("Scraping failed: %s", e)
             return {
                 "status": "error",
                 "images": {},
@@ -269,18 +411,22 @@ class IRRESOfficeImagesScraper:
             }
 
 
-def get_irres_office_images() -> Dict[str, any]:
+def get_irres_office_images(use_cache: bool = True) -> Dict[str, any]:
     """
     Convenience function to fetch IRRES office images.
     
+    Args:
+        use_cache: Serve a cached result if it is younger than CACHE_TTL (default: True)
+    
     Returns:
         Dictionary with office images
     """
-    scraper = IRRESOfficeImagesScraper()
-    return scraper.scrape()
+    return _cached('office-images', IRRESOfficeImagesScraper().scrape, use_cache)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Example usage
     print("=== Locations ===")
     scraper = IRRESLocationScraper()
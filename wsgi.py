@@ -2,10 +2,15 @@
 
 """
 Wsgi entry point for production deployment
-Use with Gunicorn or uWSGI
+Use with Gunicorn or uWSGI:
+    gunicorn -c gunicorn.conf.py wsgi:app
 """
 
 from api import app
+import config
 
 if __name__ == "__main__":
+    if config.FLASK_ENV != 'development':
+        raise SystemExit("Use gunicorn in production: gunicorn -c gunicorn.conf.py wsgi:app")
+    
     app.run()